@@ -1,7 +1,10 @@
 import os
-import requests
-import json
-import time
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from requests.adapters import HTTPAdapter
+from requests_cache import CachedSession
+from urllib3.util.retry import Retry
 
 
 class ITUCourseDataFetcher:
@@ -10,18 +13,39 @@ class ITUCourseDataFetcher:
     BASE_URL_BRANCH_CODES = "https://obs.itu.edu.tr/public/DersProgram/SearchBransKoduByProgramSeviye"
     BASE_URL_COURSE_DATA = "https://obs.itu.edu.tr/public/DersProgram/DersProgramSearch"
     OUTPUT_DIR = "data"
+    HTTP_CACHE_FILE = "http_cache.sqlite"
     PROGRAM_LEVEL = "LS"
+    MAX_WORKERS = 8
 
     def __init__(self):
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
             "Content-Type": "application/json"
         }
+        # Reuse one pooled connection to obs.itu.edu.tr across all requests, and serve
+        # unchanged responses from an on-disk cache instead of downloading them again
+        os.makedirs(self.OUTPUT_DIR, exist_ok=True)
+        self.session = CachedSession(
+            os.path.join(self.OUTPUT_DIR, self.HTTP_CACHE_FILE),
+            backend="sqlite",
+            expire_after=timedelta(hours=6),
+            cache_control=True,
+            stale_if_error=True,
+        )
+        self.session.headers.update(self.headers)
+        # Back off only when the server asks to (429/503 honor Retry-After) or fails transiently
+        retries = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 502, 503, 504],
+            respect_retry_after_header=True,
+        )
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=16, max_retries=retries))
 
     def fetch_branch_codes(self):
         """Fetch branch codes based on the program level."""
         params = {"programSeviyeTipiAnahtari": self.PROGRAM_LEVEL}
-        response = requests.get(self.BASE_URL_BRANCH_CODES, headers=self.headers, params=params)
+        response = self.session.get(self.BASE_URL_BRANCH_CODES, params=params, timeout=30)
         if response.status_code == 200:
             return response.json()
         else:
@@ -33,7 +57,7 @@ class ITUCourseDataFetcher:
             "ProgramSeviyeTipiAnahtari": self.PROGRAM_LEVEL,
             "dersBransKoduId": branch_code_id
         }
-        response = requests.get(self.BASE_URL_COURSE_DATA, headers=self.headers, params=params)
+        response = self.session.get(self.BASE_URL_COURSE_DATA, params=params, timeout=30)
         if response.status_code == 200:
             return response.json()
         else:
@@ -43,24 +67,34 @@ class ITUCourseDataFetcher:
         """Save data to a JSON file."""
         os.makedirs(self.OUTPUT_DIR, exist_ok=True)
         filepath = os.path.join(self.OUTPUT_DIR, filename)
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=4)
+        with open(filepath, "wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+
+    def fetch_and_save_branch(self, branch):
+        """Fetch and save course data for a single branch."""
+        try:
+            branch_code_id = branch["bransKoduId"]
+            branch_code = branch["dersBransKodu"]
+            print(f"Fetching data for {branch_code} (ID: {branch_code_id})...")
+            course_data = self.fetch_course_data(branch_code_id)
+            self.save_to_file(f"{branch_code}.json", course_data)
+            print(f"Data for {branch_code} saved successfully.")
+        except Exception as e:
+            print(f"Error for {branch.get('dersBransKodu', branch)}: {e}")
 
     def run(self):
         """Main function to fetch and save all course data."""
         try:
             branch_codes = self.fetch_branch_codes()
-            for branch in branch_codes:
-                branch_code_id = branch["bransKoduId"]
-                branch_code = branch["dersBransKodu"]
-                print(f"Fetching data for {branch_code} (ID: {branch_code_id})...")
-                course_data = self.fetch_course_data(branch_code_id)
-                self.save_to_file(f"{branch_code}.json", course_data)
-                print(f"Data for {branch_code} saved successfully.")
-                time.sleep(1)
+            # Branch fetches are latency-bound, so keep several in flight over the shared session
+            with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as executor:
+                for _ in executor.map(self.fetch_and_save_branch, branch_codes):
+                    pass
 
         except Exception as e:
             print(f"Error: {e}")
+        finally:
+            self.session.close()
 
 
 if __name__ == "__main__":
@@ -1,7 +1,9 @@
 import sys
 import os
-import json
 import random
+import itertools
+import functools
+import orjson
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel,
     QPushButton, QComboBox, QLineEdit, QListWidget, QTableWidget, QTableWidgetItem, QMessageBox, QFileDialog
@@ -9,6 +11,32 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QColor, QPalette, QFont
 
+# Predefined pastel colors for course blocks
+_PASTEL = tuple(QColor(r, g, b) for (r, g, b) in [
+    (255, 179, 186), (255, 223, 186), (255, 255, 186),
+    (186, 255, 201), (186, 225, 255), (255, 186, 255),
+    (179, 186, 255), (255, 200, 200), (200, 255, 200),
+    (200, 200, 255), (255, 255, 200), (200, 255, 255),
+    (255, 200, 255), (230, 230, 250), (250, 235, 215)
+])
+
+# Styling for cells where two selected courses overlap
+_OVERLAP_COLOR = QColor(255, 0, 0)
+_BOLD_FONT = QFont("Arial", weight=QFont.Weight.Bold)
+
+# Text color for course blocks
+_BLACK = QColor(0, 0, 0)
+
+# Maps weekday names to schedule table columns
+_DAY_COL = {"Monday": 0, "Tuesday": 1, "Wednesday": 2, "Thursday": 3, "Friday": 4}
+
+# Maps every "HH:MM" between 08:30 and 18:29 to its hourly row, so both start
+# times ("08:30") and end times ("10:29") resolve with a single lookup
+_TIME_ROW = {
+    f"{minutes // 60:02d}:{minutes % 60:02d}": (minutes - (8 * 60 + 30)) // 60
+    for minutes in range(8 * 60 + 30, 18 * 60 + 30)
+}
+
 
 class CourseScheduler(QMainWindow):
     """Main window for visualizing ITU course schedules."""
@@ -18,10 +46,11 @@ class CourseScheduler(QMainWindow):
         self.setWindowTitle("ITU Course Scheduler")
         self.setGeometry(200, 200, 842, 450)
 
-        self.json_data = {}  # Will hold the loaded JSON data
-        self.selected_crns = []  # List of selected CRNs to visualize
+        self._by_crn = {}  # Maps CRN strings to course entries of the loaded department
+        self.selected_crns = {}  # Selected CRNs to visualize (dict keys keep insertion order)
         self.color_map = {}  # Maps CRNs to QColor for consistent block coloring
-        self.pastel_colors = self.get_pastel_colors()  # Predefined pastel colors
+        self._state_dirty = False  # Whether selected CRNs changed since the state was loaded
+        self._color_iter = itertools.cycle(random.sample(_PASTEL, len(_PASTEL)))  # Shuffled, repeating pastel colors
 
         self.init_ui()
         self.load_state()
@@ -114,11 +143,12 @@ class CourseScheduler(QMainWindow):
 
     def load_departments(self):
         """Populate the department selector with the .json files in the 'data' directory."""
+        with os.scandir("data") as it:
+            names = sorted(e.name[:-5] for e in it if e.is_file() and e.name.endswith(".json"))
+        self.department_selector.blockSignals(True)
         self.department_selector.addItem("Select Department")
-        for file in os.listdir("data"):
-            if file.endswith(".json"):
-                department_name = file.replace(".json", "")
-                self.department_selector.addItem(department_name)
+        self.department_selector.addItems(names)
+        self.department_selector.blockSignals(False)
 
     def load_schedule_data(self):
         """Load the schedule data from the selected department's JSON file."""
@@ -128,20 +158,28 @@ class CourseScheduler(QMainWindow):
 
         file_path = os.path.join("data", selected_dept + ".json")
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                self.json_data = json.load(f)
+            self._by_crn = self._read_dept_file(file_path)
         except Exception as e:
             QMessageBox.critical(self, "Error", str(e))
-            self.json_data = {}
+            self._by_crn = {}
 
         self.update_schedule()
 
+    @staticmethod
+    @functools.lru_cache(maxsize=16)
+    def _read_dept_file(path):
+        """Parse a department file into a CRN -> course index, cached per path."""
+        with open(path, "rb") as f:
+            data = orjson.loads(f.read())
+        return {str(c["crn"]): c for c in data.get("dersProgramList", [])}
+
     def add_crn(self):
         """Add a CRN to the selected list and refresh the schedule."""
         crn = self.crn_input.text().strip()
         if crn.isdigit():
             if crn not in self.selected_crns:
-                self.selected_crns.append(crn)
+                self.selected_crns[crn] = None
+                self._state_dirty = True
                 course_code = self.get_course_code(crn)
                 self.crn_list.addItem(f"{crn} - {course_code}")
             self.crn_input.clear()
@@ -155,20 +193,29 @@ class CourseScheduler(QMainWindow):
         if selected_item:
             crn_text = selected_item.text()
             crn = crn_text.split(" - ")[0]
-            self.selected_crns.remove(crn)
+            del self.selected_crns[crn]
+            self._state_dirty = True
             self.crn_list.takeItem(self.crn_list.row(selected_item))
             self.update_schedule()
 
     def update_schedule(self):
         """Clear and reconstruct the schedule table based on selected CRNs."""
-        self.schedule_table.clearContents()
-        for row in range(self.schedule_table.rowCount()):
-            for col in range(self.schedule_table.columnCount()):
-                self.schedule_table.setSpan(row, col, 1, 1)
-
-        for course in self.json_data.get("dersProgramList", []):
-            if course["crn"] in self.selected_crns:
-                self.add_course_blocks(course)
+        # Suspend repaints and signals so the rebuild is drawn once at the end
+        self.schedule_table.setUpdatesEnabled(False)
+        self.schedule_table.blockSignals(True)
+        try:
+            self.schedule_table.clearContents()
+            for row in range(self.schedule_table.rowCount()):
+                for col in range(self.schedule_table.columnCount()):
+                    self.schedule_table.setSpan(row, col, 1, 1)
+
+            for crn in self.selected_crns:
+                if crn in self._by_crn:
+                    self.add_course_blocks(self._by_crn[crn])
+        finally:
+            self.schedule_table.blockSignals(False)
+            self.schedule_table.setUpdatesEnabled(True)
+            self.schedule_table.viewport().update()
 
     def add_course_blocks(self, course):
         """Create table blocks for the given course (which may span multiple days/times)."""
@@ -177,7 +224,7 @@ class CourseScheduler(QMainWindow):
 
         crn = course["crn"]
         if crn not in self.color_map:
-            self.color_map[crn] = self.pastel_colors.pop()
+            self.color_map[crn] = next(self._color_iter)
 
         for day, time_range in zip(days, times):
             start_str, end_str = time_range.split("/")
@@ -188,16 +235,16 @@ class CourseScheduler(QMainWindow):
                 continue
 
             row_span = end_row - start_row + 1
-            if self.schedule_table.item(start_row, col):
-                existing_item = self.schedule_table.item(start_row, col)
-                existing_item.setBackground(QColor("red"))
+            existing_item = self.schedule_table.item(start_row, col)
+            if existing_item is not None:
+                existing_item.setBackground(_OVERLAP_COLOR)
                 existing_item.setToolTip("Overlapping Courses!")
-                existing_item.setFont(QFont("Arial", weight=QFont.Weight.Bold))
+                existing_item.setFont(_BOLD_FONT)
                 return
 
             self.schedule_table.setSpan(start_row, col, row_span, 1)
             item = QTableWidgetItem(course["dersKodu"])
-            item.setForeground(QColor("black"))  # Change text color to black
+            item.setForeground(_BLACK)
             item.setBackground(self.color_map[crn])
             item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
             item.setData(Qt.ItemDataRole.UserRole, course)
@@ -205,39 +252,16 @@ class CourseScheduler(QMainWindow):
 
     def time_to_row_index(self, time_str):
         """Convert a time string like '08:30' into a row index."""
-        try:
-            hour, minute = map(int, time_str.split(":"))
-        except ValueError:
-            return None
-        total_minutes = (hour * 60) + minute
-        start_minutes = (8 * 60) + 30
-        diff = total_minutes - start_minutes
-        row = diff // 60
-        return row if 0 <= row < 10 else None
+        return _TIME_ROW.get(time_str)
 
     def get_day_index(self, day):
         """Return the column index for a given weekday."""
-        days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
-        return days.index(day) if day in days else None
+        return _DAY_COL.get(day)
 
     def get_course_code(self, crn):
         """Get course code for a given CRN."""
-        for course in self.json_data.get("dersProgramList", []):
-            if course["crn"] == crn:
-                return course["dersKodu"]
-        return "Unknown"
-
-    def get_pastel_colors(self):
-        """Generate 15 predefined pastel colors."""
-        colors = [
-            QColor(255, 179, 186), QColor(255, 223, 186), QColor(255, 255, 186),
-            QColor(186, 255, 201), QColor(186, 225, 255), QColor(255, 186, 255),
-            QColor(179, 186, 255), QColor(255, 200, 200), QColor(200, 255, 200),
-            QColor(200, 200, 255), QColor(255, 255, 200), QColor(200, 255, 255),
-            QColor(255, 200, 255), QColor(230, 230, 250), QColor(250, 235, 215)
-        ]
-        random.shuffle(colors)
-        return colors
+        course = self._by_crn.get(crn)
+        return course["dersKodu"] if course else "Unknown"
 
     def on_cell_clicked(self, row, column):
         """Show course details when a table cell is clicked."""
@@ -267,23 +291,27 @@ class CourseScheduler(QMainWindow):
             pixmap.save(file_path)
 
     def save_state(self):
-        """Save selected CRNs to a JSON file."""
-        with open("state.json", "w") as f:
-            json.dump({"selected_crns": self.selected_crns}, f)
+        """Save selected CRNs to a JSON file, replacing it atomically."""
+        tmp_path = "state.json.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(orjson.dumps({"selected_crns": list(self.selected_crns)}))
+        os.replace(tmp_path, "state.json")
+        self._state_dirty = False
 
     def load_state(self):
         """Load selected CRNs from a JSON file."""
         try:
-            with open("state.json", "r") as f:
-                state = json.load(f)
-                self.selected_crns = state.get("selected_crns", [])
+            with open("state.json", "rb") as f:
+                state = orjson.loads(f.read())
+                self.selected_crns = dict.fromkeys(state.get("selected_crns", []))
                 self.update_schedule()
         except FileNotFoundError:
             pass
 
     def closeEvent(self, event):
         """Handle window close event."""
-        self.save_state()
+        if self._state_dirty:
+            self.save_state()
         super().closeEvent(event)
 
 